@@ -5,7 +5,7 @@ import json
 # note, only used for non-cryptographic randomness:
 import random
 from math import ceil
-from typing import List, Optional, Tuple, Union
+from typing import Iterable, List, Optional, Tuple, Union
 
 from bitcointx.core import (CMutableTransaction, CTxInWitness,
                             CMutableOutPoint, CMutableTxIn, CTransaction,
@@ -338,7 +338,8 @@ def sign(tx: CMutableTransaction,
 def mktx(ins: List[Tuple[bytes, int]],
          outs: List[dict],
          version: int = 1,
-         locktime: int = 0) -> CMutableTransaction:
+         locktime: int = 0,
+         nsequence: Optional[int] = None) -> CMutableTransaction:
     """ Given a list of input tuples (txid(bytes), n(int)),
     and a list of outputs which are dicts with
     keys "address" (value should be *str* not CCoinAddress) (
@@ -346,16 +347,19 @@ def mktx(ins: List[Tuple[bytes, int]],
     should be CScript)),
     "value" (value should be integer satoshis), outputs a
     CMutableTransaction object.
-    Tx version and locktime are optionally set, for non-default
-    locktimes, inputs are given nSequence as per below comment.
+    Tx version and locktime are optionally set; if `nsequence` is
+    given it is applied to all inputs (e.g. to signal rbf), else
+    for non-default locktimes, inputs are given nSequence as per
+    below comment.
     """
     vin = []
     vout = []
     # This does NOT trigger rbf and mimics Core's standard behaviour as of
     # Jan 2019.
-    # Tx creators wishing to use rbf will need to set it explicitly outside
-    # of this function.
-    if locktime != 0:
+    # Tx creators wishing to use rbf will need to pass nsequence explicitly.
+    if nsequence is not None:
+        sequence = nsequence
+    elif locktime != 0:
         sequence = 0xffffffff - 1
     else:
         sequence = 0xffffffff
@@ -374,17 +378,22 @@ def mktx(ins: List[Tuple[bytes, int]],
         vout.append(out)
     return CMutableTransaction(vin, vout, nLockTime=locktime, nVersion=version)
 
-def make_shuffled_tx(ins: List[Tuple[bytes, int]],
+def make_shuffled_tx(ins: Iterable[Tuple[bytes, int]],
                      outs: List[dict],
                      version: int = 1,
-                     locktime: int = 0) -> CMutableTransaction:
+                     locktime: int = 0,
+                     nsequence: Optional[int] = None) -> CMutableTransaction:
     """ Simple wrapper to ensure transaction
     inputs and outputs are randomly ordered.
-    NB: This mutates ordering of `ins` and `outs`.
+    `ins` may be any iterable of input tuples (e.g. a dict keys
+    view); it is copied before shuffling, so is left untouched.
+    NB: This mutates ordering of `outs`.
     """
+    ins = list(ins)
     random.shuffle(ins)
     random.shuffle(outs)
-    return mktx(ins, outs, version=version, locktime=locktime)
+    return mktx(ins, outs, version=version, locktime=locktime,
+                nsequence=nsequence)
 
 def verify_tx_input(tx: CTransaction,
                     i: int,
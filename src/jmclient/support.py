@@ -1,5 +1,5 @@
-from functools import reduce
 import random
+from operator import itemgetter
 from jmbase.support import get_log
 from decimal import Decimal
 from .configure import get_bondless_makers_allowance
@@ -66,13 +66,13 @@ def rand_weighted_choice(n, p_arr):
 def select(unspent, value):
     """Default coin selection algorithm.
     """
-    value = int(value)
-    high = [u for u in unspent if u["value"] >= value]
-    high.sort(key=lambda u: u["value"])
-    low = [u for u in unspent if u["value"] < value]
-    low.sort(key=lambda u: -u["value"])
-    if len(high):
-        return [high[0]]
+    value, key = int(value), itemgetter("value")
+    high = [u for u in unspent if key(u) >= value]
+    if high:
+        # only the smallest such utxo is used; no need to sort:
+        return [min(high, key=key)]
+    low = sorted((u for u in unspent if key(u) < value), key=key,
+                 reverse=True)
     i, tv = 0, 0
     while tv < value and i < len(low):
         tv += low[i]["value"]
@@ -89,15 +89,15 @@ def select_gradual(unspent, value):
     utxos less than the target value; if the target value is larger than the
     sum of all smaller utxos, uses the smallest utxo larger than the value.
     """
-    value, key = int(value), lambda u: u["value"]
-    high = sorted([u for u in unspent if key(u) >= value], key=key)
-    low = sorted([u for u in unspent if key(u) < value], key=key)
-    lowsum = reduce(lambda x, y: x + y, map(key, low), 0)
+    value, key = int(value), itemgetter("value")
+    high = [u for u in unspent if key(u) >= value]
+    low = sorted((u for u in unspent if key(u) < value), key=key)
+    lowsum = sum(map(key, low))
     if value > lowsum:
         if len(high) == 0:
             raise NotEnoughFundsException(value, lowsum)
         else:
-            return [high[0]]
+            return [min(high, key=key)]
     else:
         start, end, total = 0, 0, 0
         while total < value:
@@ -115,7 +115,7 @@ def select_greedy(unspent, value):
     extraneous utxos, preferring to keep multiple small ones.
     """
     original_value = value
-    value, key, cursor = int(value), lambda u: u['value'], 0
+    value, key, cursor = int(value), itemgetter('value'), 0
     utxos, picked = sorted(unspent, key=key), []
     for utxo in utxos:  # find the smallest consecutive sum >= value
         value -= key(utxo)
@@ -144,15 +144,15 @@ def select_greediest(unspent, value):
     exceeds the target value; if the target value is larger than the sum of
     all smaller utxos, uses the smallest utxo larger than the target value.
     """
-    value, key = int(value), lambda u: u["value"]
-    high = sorted([u for u in unspent if key(u) >= value], key=key)
-    low = sorted([u for u in unspent if key(u) < value], key=key)
-    lowsum = reduce(lambda x, y: x + y, map(key, low), 0)
+    value, key = int(value), itemgetter("value")
+    high = [u for u in unspent if key(u) >= value]
+    low = sorted((u for u in unspent if key(u) < value), key=key)
+    lowsum = sum(map(key, low))
     if value > lowsum:
         if len(high) == 0:
             raise NotEnoughFundsException(value, lowsum)
         else:
-            return [high[0]]
+            return [min(high, key=key)]
     else:
         end, total = 0, 0
         while total < value:
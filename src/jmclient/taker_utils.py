@@ -3,7 +3,7 @@ import pprint
 import os
 import sys
 import time
-import numbers
+import random
 from typing import Callable, List, Optional, Tuple, Union
 
 from jmbase import get_log, jmprint, bintohex, hextobin, \
@@ -14,8 +14,7 @@ from .schedule import human_readable_schedule_entry, tweak_tumble_schedule,\
 from .wallet import BaseWallet, estimate_tx_fee, compute_tx_locktime, \
     FidelityBondMixin, UnknownAddressForLabel
 from .wallet_service import WalletService
-from jmbitcoin import make_shuffled_tx, amount_to_str, \
-                       PartiallySignedTransaction, CMutableTxOut,\
+from jmbitcoin import mktx, amount_to_str, CMutableTxOut, \
                        human_readable_transaction
 from jmbase.support import EXIT_SUCCESS
 log = get_log()
@@ -25,15 +24,6 @@ Utility functions for tumbler-style takers;
 Currently re-used by CLI script tumbler.py and joinmarket-qt
 """
 
-def get_utxo_scripts(wallet: BaseWallet, utxos: dict) -> list:
-    # given a Joinmarket wallet and a set of utxos
-    # as passed from `get_utxos_by_mixdepth` at one mixdepth,
-    # return the list of script types for each utxo
-    script_types = []
-    for utxo in utxos.values():
-        script_types.append(wallet.get_outtype(utxo["address"]))
-    return script_types
-
 def direct_send(wallet_service: WalletService,
                 mixdepth: int,
                 dest_and_amounts: List[Tuple[str, int]],
@@ -81,32 +71,40 @@ def direct_send(wallet_service: WalletService,
     assert isinstance(dest_and_amounts, list)
     assert len(dest_and_amounts) > 0
     assert custom_change_addr is None or validate_address(custom_change_addr)[0]
-    assert isinstance(mixdepth, numbers.Integral)
+    assert isinstance(mixdepth, int)
     assert mixdepth >= 0
-    assert isinstance(wallet_service.wallet, BaseWallet)
+    # bind attributes used repeatedly in the loop below to locals:
+    wallet = wallet_service.wallet
+    get_outtype = wallet_service.get_outtype
+    assert isinstance(wallet, BaseWallet)
+    is_fb_wallet = isinstance(wallet, FidelityBondMixin)
+    fb_mixdepth = FidelityBondMixin.FIDELITY_BOND_MIXDEPTH
+    is_fb_mixdepth = mixdepth == fb_mixdepth
 
     for target in dest_and_amounts:
-        destination = target[0]
-        amount = target[1]
-        assert validate_address(destination)[0] or \
-            is_burn_destination(destination)
+        destination, amount = target
+        # both of these checks re-parse the address string, so
+        # do them once per destination and reuse the results:
+        is_valid = validate_address(destination)[0]
+        is_burn = is_burn_destination(destination)
+        assert is_valid or is_burn
         if amount == 0:
             assert custom_change_addr is None and \
                 len(dest_and_amounts) == 1
             is_sweep = True
-        assert isinstance(amount, numbers.Integral)
+        assert isinstance(amount, int)
         assert amount >= 0
-        if is_burn_destination(destination):
+        if is_burn:
             #Additional checks
-            if not isinstance(wallet_service.wallet, FidelityBondMixin):
+            if not is_fb_wallet:
                 log.error("Only fidelity bond wallets can burn coins")
                 return
             if answeryes:
                 log.error("Burning coins not allowed without asking for confirmation")
                 return
-            if mixdepth != FidelityBondMixin.FIDELITY_BOND_MIXDEPTH:
+            if not is_fb_mixdepth:
                 log.error("Burning coins only allowed from mixdepth " + str(
-                    FidelityBondMixin.FIDELITY_BOND_MIXDEPTH))
+                    fb_mixdepth))
                 return
             if amount != 0:
                 log.error("Only sweeping allowed when burning coins, to keep "
@@ -119,7 +117,7 @@ def direct_send(wallet_service: WalletService,
         # This is represented by a return value `None`.
         # Note that this does *not* imply we accept any nonstandard
         # output script, because we already called `validate_address`.
-        outtypes.append(wallet_service.get_outtype(destination))
+        outtypes.append(get_outtype(destination))
         total_outputs_val += amount
 
     txtype = wallet_service.get_txtype()
@@ -129,13 +127,18 @@ def direct_send(wallet_service: WalletService,
         destination = dest_and_amounts[0][0]
         amount = dest_and_amounts[0][1]
         utxos = wallet_service.get_utxos_by_mixdepth()[mixdepth]
-        if utxos == {}:
+        if not utxos:
             log.error(
                 f"There are no available utxos in mixdepth {mixdepth}, "
                  "quitting.")
             return
-        total_inputs_val = sum([va['value'] for u, va in utxos.items()])
-        script_types = get_utxo_scripts(wallet_service.wallet, utxos)
+        # struct-of-arrays layout: parallel per-utxo sequences in dict
+        # order, so the value total is a C-level sum over a flat int
+        # list and later scans need no per-element dict lookups:
+        utxo_scripts = [va['script'] for va in utxos.values()]
+        utxo_values = [va['value'] for va in utxos.values()]
+        total_inputs_val = sum(utxo_values)
+        script_types = [get_outtype(va['address']) for va in utxos.values()]
         fee_est = estimate_tx_fee(len(utxos), 1, txtype=script_types,
             outtype=outtypes[0])
         outs = [{"address": destination,
@@ -163,28 +166,36 @@ def direct_send(wallet_service: WalletService,
         initial_fee_est = estimate_tx_fee(8, len(dest_and_amounts) + 1,
                                           txtype=txtype, outtype=outtypes)
         utxos = wallet_service.select_utxos(mixdepth, amount + initial_fee_est,
-                                            includeaddr=True)
-        script_types = get_utxo_scripts(wallet_service.wallet, utxos)
+                                            includeaddr=True,
+                                            include_script_type=True)
+        # see note on the struct-of-arrays layout in the sweep branch:
+        utxo_scripts = [va['script'] for va in utxos.values()]
+        utxo_values = [va['value'] for va in utxos.values()]
+        script_types = [va['script_type'] for va in utxos.values()]
         if len(utxos) < 8:
             fee_est = estimate_tx_fee(len(utxos), len(dest_and_amounts) + 1,
                                       txtype=script_types, outtype=outtypes)
         else:
             fee_est = initial_fee_est
-        total_inputs_val = sum([va['value'] for u, va in utxos.items()])
+        total_inputs_val = sum(utxo_values)
         changeval = total_inputs_val - fee_est - total_outputs_val
-        outs = []
-        for out in dest_and_amounts:
-            outs.append({"value": out[1], "address": out[0]})
+        outs = [{"value": amt, "address": addr}
+                for addr, amt in dest_and_amounts]
         change_addr = wallet_service.get_internal_addr(mixdepth) \
             if custom_change_addr is None else custom_change_addr
         outs.append({"value": changeval, "address": change_addr})
 
     #compute transaction locktime, has special case for spending timelocked coins
     tx_locktime = compute_tx_locktime()
-    if mixdepth == FidelityBondMixin.FIDELITY_BOND_MIXDEPTH and \
-            isinstance(wallet_service.wallet, FidelityBondMixin):
-        for outpoint, utxo in utxos.items():
-            path = wallet_service.script_to_path(utxo["script"])
+    if is_fb_mixdepth and is_fb_wallet:
+        for script in utxo_scripts:
+            # timelocked coins are the only p2wsh-type utxos a fidelity
+            # bond wallet can hold; any other script (p2wpkh) cannot
+            # have a timelocked path, so a cheap check on the witness
+            # program prefix lets us skip the path lookup entirely:
+            if not script.startswith(b'\x00\x20'):
+                continue
+            path = wallet_service.script_to_path(script)
             if not FidelityBondMixin.is_timelocked_path(path):
                 continue
             path_locktime = path[-1]
@@ -198,29 +209,36 @@ def direct_send(wallet_service: WalletService,
     log.info("Using a fee of: " + amount_to_str(fee_est) + ".")
     if not is_sweep:
         log.info("Using a change value of: " + amount_to_str(changeval) + ".")
-    tx = make_shuffled_tx(list(utxos.keys()), outs,
-                          version=2, locktime=tx_locktime)
-
-    if optin_rbf:
-        for inp in tx.vin:
-            inp.nSequence = 0xffffffff - 2
+    # shuffle input and output order here (as `make_shuffled_tx` would)
+    # so that we keep hold of the shuffled outpoint order: tx.vin is
+    # constructed in that order, which saves re-deriving each outpoint
+    # from tx.vin by reversing prevout hashes in the loop below.
+    shuffled_outpoints = list(utxos)
+    random.shuffle(shuffled_outpoints)
+    random.shuffle(outs)
+    # if opting in to rbf, the nSequence is applied during input
+    # construction, rather than mutating every input afterwards:
+    tx = mktx(shuffled_outpoints, outs,
+              version=2, locktime=tx_locktime,
+              nsequence=0xffffffff - 2 if optin_rbf else None)
 
-    inscripts = {}
-    spent_outs = []
-    for i, txinp in enumerate(tx.vin):
-        u = (txinp.prevout.hash[::-1], txinp.prevout.n)
-        inscripts[i] = (utxos[u]["script"], utxos[u]["value"])
-        spent_outs.append(CMutableTxOut(utxos[u]["value"],
-                                        utxos[u]["script"]))
+    u_to_sv = dict(zip(utxos, zip(utxo_scripts, utxo_values)))
+    # (script, value) per input, in transaction order; sign_tx accepts
+    # this dense list form directly:
+    inscripts = [u_to_sv[u] for u in shuffled_outpoints]
+    spent_outs = [CMutableTxOut(v, s) for s, v in inscripts]
     if with_final_psbt:
         # here we have the PSBTWalletMixin do the signing stage
         # for us:
         new_psbt = wallet_service.create_psbt_from_tx(tx, spent_outs=spent_outs)
-        serialized_psbt, err = wallet_service.sign_psbt(new_psbt.serialize())
+        # pass the PSBT object, which is signed in place; this avoids
+        # serializing and re-deserializing the whole PSBT:
+        signresult_and_signedpsbt, err = wallet_service.sign_psbt(
+            new_psbt, with_sign_result=True)
         if err:
             log.error("Failed to sign PSBT, quitting. Error message: " + err)
             return False
-        new_psbt_signed = PartiallySignedTransaction.deserialize(serialized_psbt)
+        signresult, new_psbt_signed = signresult_and_signedpsbt
         print("Completed PSBT created: ")
         print(wallet_service.human_readable_psbt(new_psbt_signed))
         return new_psbt_signed
@@ -230,8 +248,13 @@ def direct_send(wallet_service: WalletService,
             log.error("Failed to sign transaction, quitting. Error msg: " + msg)
             return
         log.info("Got signed transaction:\n")
-        log.info(human_readable_transaction(tx))
-        actual_amount = amount if amount != 0 else total_inputs_val - fee_est
+        # serializing/pretty-printing the whole tx is not cheap for
+        # large sweeps; do it once and reuse for the accept callback:
+        hr_tx = human_readable_transaction(tx)
+        log.info(hr_tx)
+        # a zero amount means sweep, so the actual amount is whatever
+        # the inputs provide after fees:
+        actual_amount = amount or total_inputs_val - fee_est
         sending_info = "Sends: " + amount_to_str(actual_amount) + \
             " to destination: " + destination
         if custom_change_addr:
@@ -243,8 +266,8 @@ def direct_send(wallet_service: WalletService,
                     log.info("You chose not to broadcast the transaction, quitting.")
                     return False
             else:
-                accepted = accept_callback(human_readable_transaction(tx),
-                                           destination, actual_amount, fee_est,
+                accepted = accept_callback(hr_tx, destination,
+                                           actual_amount, fee_est,
                                            custom_change_addr)
                 if not accepted:
                     return False
@@ -254,16 +277,17 @@ def direct_send(wallet_service: WalletService,
             except UnknownAddressForLabel:
                 # ignore, will happen with custom change not part of a wallet
                 pass
-        if jm_single().bc_interface.pushtx(tx.serialize()):
+        raw_tx = tx.serialize()
+        if jm_single().bc_interface.pushtx(raw_tx):
             txid = bintohex(tx.GetTxid()[::-1])
             successmsg = "Transaction sent: " + txid
-            cb = log.info if not info_callback else info_callback
+            cb = info_callback or log.info
             cb(successmsg)
             txinfo = txid if not return_transaction else tx
             return txinfo
         else:
             errormsg = "Transaction broadcast failed!"
-            cb = log.error if not error_callback else error_callback
+            cb = error_callback or log.error
             cb(errormsg)
             return False
 
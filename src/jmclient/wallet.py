@@ -79,6 +79,16 @@ class Mnemonic(MnemonicParent):
     def detect_language(cls, code):
         return "english"
 
+@functools.lru_cache(maxsize=4096)
+def _estimate_tx_size_cached(ins: tuple, outs: tuple):
+    """ Pure, structural part of the fee estimate: the size of a
+    transaction depends only on its input and output script types,
+    which recur constantly across sends, so cache the results.
+    The volatile fee rate is applied by `estimate_tx_fee`.
+    Arguments must be (hashable) tuples of script type strings.
+    """
+    return btc.estimate_tx_size(ins, outs)
+
 def estimate_tx_fee(ins, outs, txtype='p2pkh', outtype=None, extra_bytes=0):
     '''Returns an estimate of the number of satoshis required
     for a transaction with the given number of inputs and outputs,
@@ -117,26 +127,26 @@ def estimate_tx_fee(ins, outs, txtype='p2pkh', outtype=None, extra_bytes=0):
 
     # See docstring for explanation:
     if isinstance(txtype, str):
-        ins = [txtype] * ins
+        ins = (txtype,) * ins
     else:
         assert isinstance(txtype, list)
-        ins = txtype
+        ins = tuple(txtype)
     if outtype is None:
-        outs = [txtype] * outs
+        outs = (txtype,) * outs
     elif isinstance(outtype, str):
-        outs = [outtype] * outs
+        outs = (outtype,) * outs
     else:
         assert isinstance(outtype, list)
-        outs = outtype
+        outs = tuple(outtype)
 
-    # Note: the calls to `estimate_tx_size` in this code
+    # Note: the calls to `_estimate_tx_size_cached` in this code
     # block can raise `NotImplementedError` if any of the
     # strings in (ins, outs) are not known script types.
     if not btc.there_is_one_segwit_input(ins):
-        tx_estimated_bytes = btc.estimate_tx_size(ins, outs) + extra_bytes
+        tx_estimated_bytes = _estimate_tx_size_cached(ins, outs) + extra_bytes
         return int((tx_estimated_bytes * fee_per_kb)/Decimal(1000.0))
     else:
-        witness_estimate, non_witness_estimate = btc.estimate_tx_size(
+        witness_estimate, non_witness_estimate = _estimate_tx_size_cached(
             ins, outs)
         non_witness_estimate += extra_bytes
         return int(int(ceil(non_witness_estimate + 0.25*witness_estimate)*fee_per_kb)/Decimal(1000.0))
@@ -546,13 +556,18 @@ class BaseWallet(object):
 
         args:
             tx: CMutableTransaction object
-            scripts: {input_index: (output_script, amount)}
+            scripts: {input_index: (output_script, amount)}, or a list of
+                (output_script, amount) covering every input in order
             kwargs: additional arguments for engine.sign_transaction
         returns:
             True, None if success.
             False, msg if signing failed, with error msg.
         """
-        for index, (script, amount) in scripts.items():
+        if isinstance(scripts, dict):
+            scripts = scripts.items()
+        else:
+            scripts = enumerate(scripts)
+        for index, (script, amount) in scripts:
             assert amount > 0
             path = self.script_to_path(script)
             privkey, engine = self._get_key_from_path(path)
@@ -813,11 +828,13 @@ class BaseWallet(object):
 
     def select_utxos(self, mixdepth, amount, utxo_filter=None,
                      select_fn=None, maxheight=None, includeaddr=False,
-                     require_auth_address=False):
+                     require_auth_address=False, include_script_type=False):
         """
         Select a subset of available UTXOS for a given mixdepth whose value is
         greater or equal to amount. If `includeaddr` is True, adds an `address`
-        key to the returned dict.
+        key to the returned dict. If `include_script_type` is True, adds a
+        `script_type` key (as per `get_outtype`), saving callers a second
+        pass over the result to classify the scripts.
 
         args:
             mixdepth: int, mixdepth to select utxos from, must be smaller or
@@ -856,15 +873,20 @@ class BaseWallet(object):
                 standard_utxo = key
             total_value += data['value']
             data['script'] = self.get_script_from_path(data['path'])
-            if includeaddr:
-                data["address"] = self.get_address_from_path(data["path"])
+            if includeaddr or include_script_type:
+                address = self.get_address_from_path(data["path"])
+                if includeaddr:
+                    data["address"] = address
+                if include_script_type:
+                    data["script_type"] = self.get_outtype(address)
 
         if require_auth_address and not standard_utxo:
             # try to select more utxos, hoping for a standard one
             try:
                 return self.select_utxos(
                     mixdepth, total_value + 1, utxo_filter, select_fn,
-                    maxheight, includeaddr, require_auth_address)
+                    maxheight, includeaddr, require_auth_address,
+                    include_script_type)
             except NotEnoughFundsException:
                 # recursive utxo selection was unsuccessful, give up
                 return {}
@@ -1531,7 +1553,9 @@ class PSBTWalletMixin(object):
         return new_psbt
 
     def sign_psbt(self, in_psbt, with_sign_result=False):
-        """ Given a serialized PSBT in raw binary format,
+        """ Given a serialized PSBT in raw binary format, or an already
+        deserialized btc.PartiallySignedTransaction object (which is then
+        signed in place, avoiding a serialization round-trip),
         iterate over the inputs and sign all that we can sign with this wallet.
         NB IT IS UP TO CALLERS TO ENSURE THAT THEY ACTUALLY WANT TO SIGN
         THIS TRANSACTION!
@@ -1543,10 +1567,13 @@ class PSBTWalletMixin(object):
         if `with_sign_result` True:
         psbt: (PSBT_SignResult object, psbt (deserialized) object)
         """
-        try:
-            new_psbt = btc.PartiallySignedTransaction.from_binary(in_psbt)
-        except Exception as e:
-            return None, "Unable to deserialize binary PSBT, error: " + repr(e)
+        if isinstance(in_psbt, btc.PartiallySignedTransaction):
+            new_psbt = in_psbt
+        else:
+            try:
+                new_psbt = btc.PartiallySignedTransaction.from_binary(in_psbt)
+            except Exception as e:
+                return None, "Unable to deserialize binary PSBT, error: " + repr(e)
         privkeys = []
         for k, v in self._utxos._utxo.items():
             for k2, v2 in v.items():
@@ -119,6 +119,44 @@ def test_mk_shuffled_tx():
             {"address": str(addr2), "value": btc.coins_to_satoshi(float("45981.23331234"))}]
     tx = btc.make_shuffled_tx(ins, outs, version=2, locktime=500000)
 
+@pytest.mark.parametrize(
+    "locktime, nsequence, expected_sequence",
+    [(0, None, 0xffffffff),
+     (500000, None, 0xffffffff - 1),
+     (0, 0xffffffff - 2, 0xffffffff - 2),
+     (500000, 0xffffffff - 2, 0xffffffff - 2),
+     ])
+def test_mktx_nsequence(locktime, nsequence, expected_sequence):
+    # an explicit nsequence argument (e.g. for rbf signalling) must be
+    # applied to every input, overriding the locktime-derived default.
+    pub = btc.privkey_to_pubkey(btc.Hash(b"priv") + b"\x01")
+    scriptPubKey = btc.CScript([btc.OP_0, btc.Hash160(pub)])
+    addr = btc.P2WPKHCoinAddress.from_scriptPubKey(scriptPubKey)
+    ins = [(btc.Hash(b"blah"), 7), (btc.Hash(b"foo"), 15)]
+    outs = [{"address": str(addr), "value": btc.coins_to_satoshi(float("0.1"))}]
+    for txmaker in (btc.mktx, btc.make_shuffled_tx):
+        tx = txmaker(ins, outs, version=2, locktime=locktime,
+                     nsequence=nsequence)
+        assert tx.nLockTime == locktime
+        assert all(txin.nSequence == expected_sequence for txin in tx.vin)
+
+def test_make_shuffled_tx_ins_iterable():
+    # make_shuffled_tx accepts any iterable of input tuples (e.g. a dict
+    # keys view) and copies it before shuffling, so callers' lists are
+    # never reordered in place.
+    pub = btc.privkey_to_pubkey(btc.Hash(b"priv") + b"\x01")
+    scriptPubKey = btc.CScript([btc.OP_0, btc.Hash160(pub)])
+    addr = btc.P2WPKHCoinAddress.from_scriptPubKey(scriptPubKey)
+    ins = [(btc.Hash(bytes([i])), i) for i in range(8)]
+    outs = [{"address": str(addr), "value": btc.coins_to_satoshi(float("0.1"))}]
+    tx = btc.make_shuffled_tx({i: None for i in ins}.keys(), outs)
+    assert {(txin.prevout.hash[::-1], txin.prevout.n)
+            for txin in tx.vin} == set(ins)
+    ins_before = list(ins)
+    for _ in range(5):
+        btc.make_shuffled_tx(ins, outs)
+        assert ins == ins_before
+
 def test_bip143_tv():
     # p2sh-p2wpkh case:
     rawtx_hex = "0100000001db6b1b20aa0fd7b23880be2ecbd4a98130974cf4748fb66092ac4d3ceb1a54770100000000feffffff02b8b4eb0b000000001976a914a457b684d7f0d539a46a45bbc043f35b59d0d96388ac0008af2f000000001976a914fd270b1ee6abcaea97fea7ad0402e8bd8ad6d77c88ac92040000"
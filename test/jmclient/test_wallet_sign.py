@@ -0,0 +1,83 @@
+"""Backend-free tests of the wallet signing entrypoints:
+the dict/list forms of the `scripts` argument to sign_tx, and
+sign_psbt accepting an already-deserialized PSBT object."""
+
+import pytest
+import jmbitcoin as btc
+import jmclient
+from jmclient import load_test_config, SegwitLegacyWallet, \
+    VolatileStorage, get_network
+from commontest import DummyBlockchainInterface
+
+
+def make_wallet_with_utxos(num=2, value=10**8):
+    storage = VolatileStorage()
+    SegwitLegacyWallet.initialize(storage, get_network())
+    wallet = SegwitLegacyWallet(storage)
+    scripts = []
+    for i in range(num):
+        script = wallet.get_internal_script(0)
+        wallet.add_utxo(btc.Hash(bytes([i])), i, script, value)
+        scripts.append(script)
+    return wallet, scripts
+
+
+def make_unsigned_tx(destination, num_ins=2, value=10**8):
+    ins = [(btc.Hash(bytes([i])), i) for i in range(num_ins)]
+    outs = [{"address": destination, "value": num_ins * value - 10000}]
+    return btc.mktx(ins, outs)
+
+
+def test_sign_tx_scripts_dict_or_list(setup_env_nodeps):
+    # sign_tx accepts scripts either as {input_index: (script, amount)}
+    # or as a dense list of (script, amount) covering every input in
+    # order; both must produce the same signatures.
+    value = 10**8
+    wallet, scripts = make_wallet_with_utxos(value=value)
+    destination = wallet.get_internal_addr(0)
+    tx_from_dict = make_unsigned_tx(destination)
+    tx_from_list = make_unsigned_tx(destination)
+
+    success, msg = wallet.sign_tx(tx_from_dict, {
+        i: (script, value) for i, script in enumerate(scripts)})
+    assert success, msg
+    success, msg = wallet.sign_tx(tx_from_list, [
+        (script, value) for script in scripts])
+    assert success, msg
+    assert tx_from_list.serialize() == tx_from_dict.serialize()
+
+
+def test_sign_psbt_object_in_place(setup_env_nodeps):
+    # sign_psbt accepts a PartiallySignedTransaction object directly
+    # and signs it in place, as well as the raw binary serialization.
+    value = 10**8
+    wallet, scripts = make_wallet_with_utxos(value=value)
+    destination = wallet.get_internal_addr(0)
+    spent_outs = [btc.CMutableTxOut(value, btc.CScript(script))
+                  for script in scripts]
+
+    psbt = wallet.create_psbt_from_tx(make_unsigned_tx(destination),
+                                      spent_outs=spent_outs)
+    signresult_and_signedpsbt, err = wallet.sign_psbt(
+        psbt, with_sign_result=True)
+    assert err is None, err
+    signresult, signed_psbt = signresult_and_signedpsbt
+    assert signed_psbt is psbt
+    assert signresult.num_inputs_signed == len(scripts)
+    assert signresult.num_inputs_final == len(scripts)
+    assert signresult.is_final
+
+    # binary input is still accepted and returns a binary signed psbt:
+    psbt2 = wallet.create_psbt_from_tx(make_unsigned_tx(destination),
+                                       spent_outs=spent_outs)
+    signed_psbt_bin, err = wallet.sign_psbt(psbt2.serialize())
+    assert err is None, err
+    assert signed_psbt_bin != psbt2.serialize()
+
+
+@pytest.fixture
+def setup_env_nodeps(monkeypatch):
+    monkeypatch.setattr(jmclient.configure, 'get_blockchain_interface_instance',
+                        lambda x: DummyBlockchainInterface())
+    btc.select_chain_params("bitcoin/regtest")
+    load_test_config()